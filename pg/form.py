@@ -9,6 +9,13 @@ import streamlit as st
 from property_map.db import Database
 from property_map.map_utils import extract_coordinates
 
+
+@st.cache_resource
+def get_db() -> Database:
+    """Create the Supabase ``Database`` helper once and reuse it across reruns."""
+    return Database()
+
+
 st.header("Add a new listing")
 
 with st.form("property_form", clear_on_submit=True):
@@ -28,21 +35,35 @@ with st.form("property_form", clear_on_submit=True):
     submitted = st.form_submit_button("Add to map")
 
     if submitted:
-        lat, lon = extract_coordinates(google_maps_url)
-        desk_flag = 1 if has_a_desk == "Yes" else 0
-        supabase = Database()
-        supabase.insert_property(
-            title,
-            listing_url,
-            google_maps_url,
-            lat,
-            lon,
-            price,
-            contract_length,
-            desk_flag,
-            date_added,
-            description,
-        )
-        st.success(
-            f"Listing added to map: {title} ({lat}, {lon}) {price} {contract_length} {desk_flag} {description}"
-        )
+        # Coordinates are parsed exactly once, here at insert time; the map
+        # page only ever reads the stored numeric columns.
+        coordinates = extract_coordinates(google_maps_url)
+        if coordinates is None:
+            st.error(
+                "Could not find coordinates in the Google Maps URL - paste a "
+                "link containing either `!3d<lat>!4d<lon>` or `@<lat>,<lon>`."
+            )
+        else:
+            lat, lon = coordinates
+            desk_flag = 1 if has_a_desk == "Yes" else 0
+            supabase = get_db()
+            supabase.insert_property(
+                title,
+                listing_url,
+                google_maps_url,
+                lat,
+                lon,
+                price,
+                contract_length,
+                desk_flag,
+                date_added,
+                description,
+            )
+            # Drop the cached Supabase reads so the new listing shows up on
+            # the map immediately instead of after CACHE_TTL expires. The map
+            # page's loaders are not importable from here (pages are scripts,
+            # not modules), so the data caches are cleared wholesale.
+            st.cache_data.clear()
+            st.success(
+                f"Listing added to map: {title} ({lat}, {lon}) {price} {contract_length} {desk_flag} {description}"
+            )
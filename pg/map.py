@@ -2,51 +2,266 @@
 
 The page reads rows from Supabase via the ``Database`` helper, places a red
 marker for the default location, and adds color-coded markers for each
-property (blue for contract length <= 6 months, orange otherwise).
+property (blue for contract length <= 6 months, orange otherwise). Marker
+records are only serialized for listings inside the last reported map
+viewport, so the payload stays small however large the table grows.
 """
 
 import folium
+import numpy as np
+import pandas as pd
 import streamlit as st
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import st_folium
 
-from property_map.db import Database
+from property_map.db import CACHE_TTL, Database
 
-st.header("Property map")
+MAP_WIDTH = 800
+MAP_HEIGHT = 600
 
-supabase = Database()
-df_default_location = supabase.fetch_properties(table="default_location")
-df_all = supabase.fetch_properties(table="all")
+# Columns requested from Supabase for the "all" table; icon_color and
+# popup_html are derived locally, and has_a_desk is only shown in the table
+# view.
+FETCH_COLS = [
+    "title",
+    "price",
+    "contract_length",
+    "date_added",
+    "description",
+    "listing_url",
+    "google_maps_url",
+    "latitude",
+    "longitude",
+    "has_a_desk",
+]
 
-start_coords = df_default_location[["latitude", "longitude"]].iloc[0].tolist()
-m = folium.Map(location=start_coords, zoom_start=13)
+# Columns shown in the listings table; icon_color/popup_html are internal.
+# st.dataframe sorts client-side, so no Python-side sort is needed.
+COLS_TO_DISPLAY = FETCH_COLS
 
-# Add marker for default location
-for index, row in df_default_location.iterrows():
-    folium.Marker(
-        location=[row["latitude"], row["longitude"]],
-        tooltip=row["title"],
-        icon=folium.Icon(color="red", icon="heart"),
-    ).add_to(m)
+# Builds each property marker client-side from one serialized record:
+# [latitude, longitude, icon_color, tooltip, popup_html].
+MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker([row[0], row[1]], {
+        radius: 7,
+        color: "black",
+        weight: 1,
+        fillColor: row[2],
+        fillOpacity: 0.8,
+    });
+    marker.bindTooltip(row[3]);
+    marker.bindPopup(row[4], {maxWidth: 300});
+    return marker;
+}
+"""
+
+
+@st.cache_data
+def get_center(
+    df_default_location: pd.DataFrame, df_all: pd.DataFrame
+) -> tuple[float, float]:
+    """Return the map center as cached ``(latitude, longitude)`` scalars.
+
+    Prefers the default location row; when that (optional) table is empty,
+    falls back to the median of the property coordinates so the map still
+    opens somewhere sensible.
+    """
+    if not df_default_location.empty:
+        row = df_default_location[["latitude", "longitude"]].iloc[0]
+        return float(row["latitude"]), float(row["longitude"])
+    if not df_all.empty:
+        return (
+            float(np.median(df_all["latitude"].to_numpy())),
+            float(np.median(df_all["longitude"].to_numpy())),
+        )
+    return 0.0, 0.0
+
+
+def build_map(
+    start_coords: tuple[float, float],
+    df_default_location: pd.DataFrame,
+    df_all: pd.DataFrame,
+) -> folium.Map:
+    """Build the Folium map for the given (viewport-filtered) properties.
 
-# Add markers for each row in the DataFrame
-for index, row in df_all.iterrows():
-    popup_text = f"""<b>{row["title"]}</b><br>
-                    <b>price</b>: {row["price"]}<br>
-                    <b>contract length</b>: {row["contract_length"]} months<br>
-                    <b>date added</b>: {row["date_added"]}<br>
-                    <b>description</b>: {row["description"]}<br>
-                    <a href='{row["listing_url"]}' target='_blank'>Link</a><br>
-                    <a href='{row["google_maps_url"]}' target='_blank'>Google Maps Link</a>"""
-    popup = folium.Popup(html=popup_text, max_width=300)
-    folium.Marker(
-        location=[row["latitude"], row["longitude"]],
-        popup=popup,
-        tooltip=row["title"],
-        icon=folium.Icon(
-            color="blue" if row["contract_length"] <= 6 else "orange", icon="home"
-        ),
+    Args:
+        start_coords: ``(latitude, longitude)`` to center the map on.
+        df_default_location: Rows of the default location table.
+        df_all: Processed property rows, including ``icon_color`` and
+            ``popup_html``, already narrowed to the visible viewport.
+
+    Returns:
+        The assembled ``folium.Map``, ready for ``st_folium``.
+    """
+    # prefer_canvas draws vector markers on a single <canvas> element instead
+    # of one DOM node per marker, which keeps Leaflet responsive as the
+    # number of listings grows.
+    m = folium.Map(location=list(start_coords), zoom_start=13, prefer_canvas=True)
+
+    # Add marker for default location; the table is optional, and the empty
+    # frame has no columns to select.
+    if not df_default_location.empty:
+        for row in df_default_location[
+            ["latitude", "longitude", "title"]
+        ].itertuples(index=False):
+            folium.Marker(
+                location=[row.latitude, row.longitude],
+                tooltip=row.title,
+                icon=folium.Icon(color="red", icon="heart"),
+            ).add_to(m)
+
+    if df_all.empty:
+        return m
+
+    # Pull each marker field as one contiguous array and zip the arrays into
+    # records for the FastMarkerCluster callback; ndarray.tolist() also
+    # converts NumPy scalars to the plain Python types JSON serialization
+    # expects. Going column-by-column avoids the object-dtype block that
+    # df[cols].values would materialize for the mixed dtypes.
+    lats = df_all["latitude"].to_numpy().tolist()
+    lons = df_all["longitude"].to_numpy().tolist()
+    colors = df_all["icon_color"].to_numpy().tolist()
+    titles = df_all["title"].to_numpy().tolist()
+    popups = df_all["popup_html"].to_numpy().tolist()
+    data = [list(record) for record in zip(lats, lons, colors, titles, popups)]
+
+    FastMarkerCluster(
+        data,
+        callback=MARKER_CALLBACK,
+        disableClusteringAtZoom=15,
     ).add_to(m)
 
-st_folium(m, width=800, height=600)
+    return m
+
+
+@st.cache_resource
+def get_db() -> Database:
+    """Create the Supabase ``Database`` helper once and reuse it across reruns."""
+    return Database()
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_default_location() -> pd.DataFrame:
+    """Load the default location rows once per cache lifetime."""
+    return get_db().fetch_properties(
+        table="default_location", columns=["latitude", "longitude", "title"]
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL)
+def load_properties(
+    min_price: int,
+    max_price: int,
+    desk_flags: tuple[int, ...],
+    bbox: tuple[float, float, float, float] | None,
+) -> pd.DataFrame:
+    """Load property rows matching the given filters and viewport.
+
+    The filters and the viewport bounding box are part of the cache key
+    and are pushed down to Supabase, so each combination is fetched at
+    most once per cache lifetime, panning back to a seen viewport hits
+    the cache, and only matching rows travel over the wire.
+    """
+    df = get_db().fetch_properties(
+        table="all",
+        columns=FETCH_COLS,
+        min_price=min_price,
+        max_price=max_price,
+        has_a_desk=desk_flags,
+        bbox=bbox,
+    )
+    if not df.empty:
+        # fetch_properties already delivers compact numeric dtypes; float32
+        # coordinates are a display-side extra (plenty of precision for a
+        # map, half the bytes for the viewport masks).
+        df["latitude"] = df["latitude"].astype("float32")
+        df["longitude"] = df["longitude"].astype("float32")
+        # Derive the marker color and popup HTML here, inside the cached
+        # scope, so the vectorized work runs once per cache miss instead of
+        # on every rerun.
+        df["icon_color"] = np.where(df["contract_length"] <= 6, "blue", "orange")
+        df["popup_html"] = (
+            "<b>" + df["title"].astype(str) + "</b><br>"
+            "<b>price</b>: " + df["price"].astype(str) + "<br>"
+            "<b>contract length</b>: " + df["contract_length"].astype(str)
+            + " months<br>"
+            "<b>date added</b>: " + df["date_added"].astype(str) + "<br>"
+            "<b>description</b>: " + df["description"].fillna("").astype(str) + "<br>"
+            "<a href='" + df["listing_url"].astype(str)
+            + "' target='_blank'>Link</a><br>"
+            "<a href='" + df["google_maps_url"].astype(str)
+            + "' target='_blank'>Google Maps Link</a>"
+        )
+    return df
+
+
+@st.fragment
+def render_map_section(df_default_location: pd.DataFrame) -> None:
+    """Render the filters, the map, and the listings table.
+
+    Decorated with ``st.fragment`` so interacting with the filter widgets
+    or the map only reruns this block, not the whole page script.
+    """
+    # The filters live in the fragment's own body: streamlit 1.49 (the
+    # pinned version) forbids fragments writing widgets to outside
+    # containers such as the sidebar.
+    price_range = st.slider(
+        "Price (USD)", min_value=0, max_value=20000, value=(0, 20000), step=100
+    )
+    desk_filter = st.multiselect(
+        "Has a desk", options=["Yes", "No"], default=["Yes", "No"]
+    )
+
+    # The keyed st_folium component stores its state in session_state before
+    # the rerun it triggers, so the bounds read here describe the viewport
+    # the user just panned or zoomed to, and they become a server-side
+    # bounding-box predicate.
+    map_state = st.session_state.get("property_map") or {}
+    bounds = map_state.get("bounds")
+    bbox = (
+        (
+            bounds["_southWest"]["lat"],
+            bounds["_southWest"]["lng"],
+            bounds["_northEast"]["lat"],
+            bounds["_northEast"]["lng"],
+        )
+        if bounds
+        else None
+    )
+
+    if desk_filter:
+        df_all = load_properties(
+            min_price=price_range[0],
+            max_price=price_range[1],
+            desk_flags=tuple(1 if option == "Yes" else 0 for option in desk_filter),
+            bbox=bbox,
+        )
+    else:
+        # Nothing selected can match anything; build the empty result locally
+        # instead of round-tripping an `in.()` filter to Supabase.
+        df_all = pd.DataFrame(columns=FETCH_COLS + ["icon_color", "popup_html"])
+
+    m = build_map(
+        get_center(df_default_location, df_all), df_default_location, df_all
+    )
+    # The stable key keeps the component mounted across fragment reruns, and
+    # feeding the last reported center/zoom back in stops the re-rendered
+    # map from snapping back to its initial view after every interaction.
+    center = map_state.get("center")
+    st_folium(
+        m,
+        width=MAP_WIDTH,
+        height=MAP_HEIGHT,
+        key="property_map",
+        center=(center["lat"], center["lng"]) if center else None,
+        zoom=map_state.get("zoom"),
+        returned_objects=["bounds", "center", "zoom"],
+    )
+
+    st.dataframe(df_all[COLS_TO_DISPLAY])
+
+
+st.header("Property map")
 
-st.dataframe(df_all)
+render_map_section(load_default_location())
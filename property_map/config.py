@@ -0,0 +1,40 @@
+"""Configuration constants for the property map database layer.
+
+Table names and tuning knobs live here so they can be adapted (e.g. when
+pointing the app at a different city's tables) without touching the data
+access code in ``property_map.db``.
+"""
+
+SCHEMA = "public"
+DATA_TABLE = "properties"
+DEFAULT_LOCATION_TABLE = "default_location"
+# Rows per insert request; keeps bulk imports under PostgREST payload limits.
+BATCH_SIZE = 1000
+# Rows per read request when streaming the properties table.
+PAGE_SIZE = 1000
+# Seconds before cached Supabase reads are refreshed; the listings change
+# rarely, so repeat reads within the TTL never leave the process.
+CACHE_TTL = 600
+# Canonical column order for property rows; used both to build insert
+# payloads and as the COPY bulk-load column list.
+PROPERTY_COLUMNS = (
+    "title",
+    "listing_url",
+    "google_maps_url",
+    "latitude",
+    "longitude",
+    "price",
+    "contract_length",
+    "has_a_desk",
+    "date_added",
+    "description",
+)
+# Width-appropriate dtypes for property columns; applied after fetch so the
+# frame does not keep the default 8-byte ints that JSON decoding produces.
+PROPERTY_DTYPES = {
+    "price": "int32",
+    "contract_length": "int16",
+    "has_a_desk": "int8",
+    "latitude": "float64",
+    "longitude": "float64",
+}
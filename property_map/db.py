@@ -1,17 +1,59 @@
+from __future__ import annotations
+
+import functools
 import os
 from datetime import date
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from property_map.config import (
+    BATCH_SIZE,
+    CACHE_TTL,
+    DATA_TABLE,
+    DEFAULT_LOCATION_TABLE,
+    PAGE_SIZE,
+    PROPERTY_COLUMNS,
+    PROPERTY_DTYPES,
+    SCHEMA,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from supabase import Client
+
+# pandas, supabase and dotenv account for most of this module's cold-start
+# import time, so they are imported lazily at first use; importing e.g.
+# property_map.map_utils alongside this module stays cheap.
+
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load the .env file once, on first use instead of at import time."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
 
-import pandas as pd
-from dotenv import load_dotenv
-from supabase import Client, create_client
+@functools.lru_cache(maxsize=8)
+def _get_client(url: str, key: str) -> Client:
+    """Return a shared Supabase client for the given project credentials.
 
-load_dotenv()  # Load environment variables from .env file
+    Creating a client builds fresh TCP/TLS and httpx pool state, so
+    instances are cached per ``(url, key)`` and survive repeated
+    ``Database()`` construction (e.g. across Streamlit reruns). The client
+    runs on a shared httpx client tuned for connection reuse (HTTP/2 with
+    explicit keep-alive pool limits).
+    """
+    import httpx
+    from supabase import create_client
+    from supabase.lib.client_options import SyncClientOptions
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-SCHEMA = "public"
-DATA_TABLE = "properties"
-DEFAULT_LOCATION_TABLE = "default_location"
+    # Keeping pooled connections alive skips a TLS handshake per request,
+    # which dominates small selects.
+    http_client = httpx.Client(
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        http2=True,
+    )
+    return create_client(url, key, options=SyncClientOptions(httpx_client=http_client))
 
 
 class Database:
@@ -35,8 +77,8 @@ class Database:
 
     def __init__(
         self,
-        supabase_url: str = SUPABASE_URL,
-        supabase_key: str = SUPABASE_KEY,
+        supabase_url: str | None = None,
+        supabase_key: str | None = None,
         schema: str = SCHEMA,
         data_table: str = DATA_TABLE,
         default_location_table: str = DEFAULT_LOCATION_TABLE,
@@ -44,18 +86,27 @@ class Database:
         """Initialize the client and configuration.
 
         Args:
-            supabase_url: Supabase project URL. Defaults to ``SUPABASE_URL``.
-            supabase_key: Supabase key. Defaults to ``SUPABASE_KEY``.
+            supabase_url: Supabase project URL. Defaults to the
+                ``SUPABASE_URL`` environment variable.
+            supabase_key: Supabase key. Defaults to the ``SUPABASE_KEY``
+                environment variable.
             schema: Database schema to use. Defaults to ``public``.
             data_table: Name of the properties table.
             default_location_table: Name of the default location table.
         """
-        self.url = supabase_url
-        self.key = supabase_key
+        _load_env()
+        self.url = supabase_url or os.getenv("SUPABASE_URL")
+        self.key = supabase_key or os.getenv("SUPABASE_KEY")
         self.schema = schema
         self.data_table = data_table
         self.default_location_table = default_location_table
-        self.client: Client = create_client(self.url, self.key)
+        # Maps the public table aliases to physical table names; built once
+        # so renaming a table never touches the fetch call sites.
+        self._table_map = {
+            "all": data_table,
+            "default_location": default_location_table,
+        }
+        self.client: Client = _get_client(self.url, self.key)
 
     def insert_property(
         self,
@@ -84,35 +135,164 @@ class Database:
             date_added: Date when the listing was added.
             description: Optional free-text description.
 
+        Raises:
+            ValueError: If latitude or longitude is missing; coordinates
+                must be parsed (e.g. from the Google Maps URL) before
+                inserting, so the map never re-parses URLs at render time.
         """
-        (
-            self.client.from_(self.data_table)
-            .insert(
-                [
-                    {
-                        "title": title,
-                        "listing_url": listing_url,
-                        "google_maps_url": google_maps_url,
-                        "latitude": latitude,
-                        "longitude": longitude,
-                        "price": price,
-                        "contract_length": contract_length,
-                        "has_a_desk": has_a_desk,
-                        "date_added": date_added.strftime("%Y-%m-%d"),
-                        "description": description,
-                    }
-                ]
+        if latitude is None or longitude is None:
+            raise ValueError(
+                "latitude and longitude are required; parse them from the "
+                "Google Maps URL before inserting"
+            )
+        # Zip the values against the prebuilt key tuple instead of hashing
+        # ten string literals per call; the same order feeds bulk loads.
+        row = dict(
+            zip(
+                PROPERTY_COLUMNS,
+                (
+                    title,
+                    listing_url,
+                    google_maps_url,
+                    latitude,
+                    longitude,
+                    price,
+                    contract_length,
+                    has_a_desk,
+                    date_added.isoformat(),
+                    description,
+                ),
             )
-            .execute()
         )
+        self.insert_properties([row])
         return None
 
-    def fetch_properties(self, table: str) -> pd.DataFrame:
+    def insert_properties(self, rows: list[dict]) -> list:
+        """Insert many property rows with batched requests.
+
+        Rows are sent in chunks of ``BATCH_SIZE`` so bulk imports avoid one
+        HTTP round-trip per row while staying under PostgREST payload limits.
+
+        Args:
+            rows: Property rows as dicts matching the table columns, with
+                ``date_added`` already serialized to ``YYYY-MM-DD``.
+
+        Returns:
+            The list of PostgREST responses, one per chunk.
+        """
+        responses = []
+        for start in range(0, len(rows), BATCH_SIZE):
+            chunk = rows[start : start + BATCH_SIZE]
+            # Prefer: return=minimal -- nothing reads the inserted rows back,
+            # so skip the server-side serialization and response parsing.
+            responses.append(
+                self.client.from_(self.data_table)
+                .insert(chunk, returning="minimal")
+                .execute()
+            )
+        return responses
+
+    def upsert_properties(
+        self, rows: list[dict], on_conflict: str = "listing_url"
+    ) -> list:
+        """Insert-or-update many property rows in batched requests.
+
+        One round-trip per chunk replaces the fetch-then-insert pattern for
+        re-imports: instead of reading existing rows to decide what to send,
+        PostgreSQL resolves conflicts on ``on_conflict`` server-side, so the
+        call is idempotent and safe to retry. Assumes a unique index on the
+        conflict column (``listing_url`` by default).
+
+        Args:
+            rows: Property rows as dicts matching the table columns, with
+                ``date_added`` already serialized to ``YYYY-MM-DD``.
+            on_conflict: Column with a unique constraint that identifies a
+                listing.
+
+        Returns:
+            The list of PostgREST responses, one per chunk.
+        """
+        responses = []
+        for start in range(0, len(rows), BATCH_SIZE):
+            chunk = rows[start : start + BATCH_SIZE]
+            responses.append(
+                self.client.from_(self.data_table)
+                .upsert(chunk, on_conflict=on_conflict, returning="minimal")
+                .execute()
+            )
+        return responses
+
+    def bulk_copy(self, rows: Iterable[dict], db_url: str | None = None) -> int:
+        """Bulk-load property rows over a direct PostgreSQL COPY stream.
+
+        The REST insert path pays HTTP and JSON overhead per batch; COPY
+        streams rows straight into PostgreSQL and is the fast path for
+        large backfills. Requires the optional ``psycopg`` package and a
+        ``SUPABASE_DB_URL`` connection string (the Supabase pooler
+        endpoint on port 6543 works well).
+
+        Args:
+            rows: Property rows as dicts with the ``PROPERTY_COLUMNS`` keys,
+                ``date_added`` already serialized to ``YYYY-MM-DD``.
+            db_url: Optional connection string; defaults to the
+                ``SUPABASE_DB_URL`` environment variable.
+
+        Returns:
+            The number of rows written.
+
+        Raises:
+            ImportError: If ``psycopg`` is not installed.
+            ValueError: If no database connection string is configured.
+        """
+        try:
+            import psycopg
+        except ImportError as exc:
+            raise ImportError(
+                "bulk_copy requires the optional psycopg package "
+                "(pip install psycopg)"
+            ) from exc
+        # Direct PostgreSQL connection string (Supabase pooler endpoint);
+        # only needed for this COPY-based path.
+        url = db_url or os.getenv("SUPABASE_DB_URL")
+        if not url:
+            raise ValueError("bulk_copy requires SUPABASE_DB_URL to be set")
+        statement = (
+            f"COPY {self.data_table} ({', '.join(PROPERTY_COLUMNS)}) FROM STDIN"
+        )
+        count = 0
+        with psycopg.connect(url) as conn:
+            with conn.cursor() as cur:
+                with cur.copy(statement) as copy:
+                    for row in rows:
+                        copy.write_row(tuple(row[col] for col in PROPERTY_COLUMNS))
+                        count += 1
+        return count
+
+    def fetch_properties(
+        self,
+        table: str,
+        columns: Sequence[str] | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        has_a_desk: Sequence[int] | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+    ) -> pd.DataFrame:
         """Fetch properties/default location rows as a pandas DataFrame.
 
+        Filters are pushed down to Supabase via PostgREST operators, so only
+        the matching rows travel over the wire instead of the whole table.
+
         Args:
             table: ``"all"`` to read from the properties table, or
                 ``"default_location"`` to read the single default location.
+            columns: Optional sequence of column names to select. Defaults
+                to every column (``"*"``).
+            min_price: If given, only return rows with ``price >= min_price``.
+            max_price: If given, only return rows with ``price <= max_price``.
+            has_a_desk: If given, only return rows whose ``has_a_desk`` flag
+                is in this sequence (e.g. ``[1]`` for desk-only listings).
+            bbox: If given, a ``(south, west, north, east)`` bounding box;
+                only rows inside it are returned.
 
         Returns:
             A ``pandas.DataFrame`` with the selected rows.
@@ -120,13 +300,142 @@ class Database:
         Raises:
             ValueError: If ``table`` is not one of the supported options.
         """
-        if table == "all":
-            table = self.data_table
-        elif table == "default_location":
-            table = self.default_location_table
-        else:
-            raise ValueError(f"Invalid table: {table}")
-        response = self.client.table(table).select("*").execute()
-        data = response.data
-        df = pd.DataFrame(data)
+        import pandas as pd
+        import pyarrow as pa
+
+        rows = self._fetch_raw(
+            table,
+            columns=columns,
+            min_price=min_price,
+            max_price=max_price,
+            has_a_desk=has_a_desk,
+            bbox=bbox,
+        )
+        if table == "default_location":
+            df = pd.DataFrame(rows)
+            if columns is not None:
+                df = df.reindex(columns=list(columns))
+            return df
+        df = pa.Table.from_pylist(rows).to_pandas()
+        if columns is not None:
+            # An empty result gives Arrow nothing to infer columns from;
+            # reindex against the requested projection so callers can always
+            # select the columns they asked for.
+            df = df.reindex(columns=list(columns))
+        # Arrow already hands string columns over efficiently; cast the
+        # numeric columns to compact widths and parse dates once here so
+        # every caller gets the lean dtypes.
+        df = df.astype(
+            {c: t for c, t in PROPERTY_DTYPES.items() if c in df.columns}
+        )
+        if "date_added" in df.columns:
+            df["date_added"] = pd.to_datetime(df["date_added"])
         return df
+
+    def fetch_properties_raw(
+        self,
+        table: str,
+        columns: Sequence[str] | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        has_a_desk: Sequence[int] | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+    ) -> list[dict]:
+        """Fetch rows as the raw list of dicts from PostgREST.
+
+        A fast path for callers that only iterate rows and do not need the
+        columnar materialization that :meth:`fetch_properties` performs.
+        Accepts the same arguments and pushdown filters.
+
+        Returns:
+            The decoded response rows, untouched.
+        """
+        return self._fetch_raw(
+            table,
+            columns=columns,
+            min_price=min_price,
+            max_price=max_price,
+            has_a_desk=has_a_desk,
+            bbox=bbox,
+        )
+
+    def _fetch_raw(
+        self,
+        table: str,
+        columns: Sequence[str] | None = None,
+        min_price: int | None = None,
+        max_price: int | None = None,
+        has_a_desk: Sequence[int] | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+    ) -> list[dict]:
+        """Run the PostgREST reads shared by the fetch methods."""
+        try:
+            physical_table = self._table_map[table]
+        except KeyError:
+            raise ValueError(f"Invalid table: {table}") from None
+        selection = ",".join(columns) if columns else "*"
+        if table == "all":
+            # Stream the table in fixed-size pages via PostgREST Range
+            # headers so peak memory stays page-sized.
+            rows: list[dict] = []
+            offset = 0
+            while True:
+                query = self.client.table(physical_table).select(selection)
+                if min_price is not None:
+                    query = query.gte("price", min_price)
+                if max_price is not None:
+                    query = query.lte("price", max_price)
+                if has_a_desk is not None:
+                    query = query.in_("has_a_desk", list(has_a_desk))
+                if bbox is not None:
+                    south, west, north, east = bbox
+                    query = (
+                        query.gte("latitude", south)
+                        .lte("latitude", north)
+                        .gte("longitude", west)
+                        .lte("longitude", east)
+                    )
+                # PostgREST gives no ordering guarantee without an explicit
+                # sort; ordering by the unique id keeps page boundaries
+                # stable under concurrent inserts.
+                page = (
+                    query.order("id")
+                    .range(offset, offset + PAGE_SIZE - 1)
+                    .execute()
+                    .data
+                )
+                rows.extend(page)
+                if len(page) < PAGE_SIZE:
+                    break
+                offset += PAGE_SIZE
+            return rows
+        # The default location table holds a single reference row; push the
+        # LIMIT down so no extra rows are transferred or parsed.
+        response = (
+            self.client.table(physical_table).select(selection).limit(1).execute()
+        )
+        return response.data
+
+    def fetch_default_location(
+        self, columns: Sequence[str] | None = None
+    ) -> dict | None:
+        """Fetch the single default location row as a plain dict.
+
+        A fast path for callers that only need the reference coordinates
+        and do not want to pay for a DataFrame wrap.
+
+        Args:
+            columns: Optional sequence of column names to select. Defaults
+                to every column (``"*"``).
+
+        Returns:
+            The row as a dict, or ``None`` if the table is empty.
+        """
+        selection = ",".join(columns) if columns else "*"
+        response = (
+            self.client.table(self.default_location_table)
+            .select(selection)
+            .limit(1)
+            .execute()
+        )
+        return response.data[0] if response.data else None